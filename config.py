@@ -12,17 +12,27 @@ START_URL = "https://publicaccess.yourcouncil.gov.uk/PublicAccess_LIVE/SearchRes
 
 # Download settings
 DOWNLOAD_DIR = "downloaded-pdfs"  # Relative to script location
-REQUEST_DELAY = 0.5  # Delay between requests (seconds)
+REQUEST_DELAY = 0.5  # Delay between requests per worker (seconds)
 MAX_WORKERS = 20  # Maximum number of concurrent downloads
+ASYNC_CONCURRENCY = 64  # Default number of concurrent downloads in async mode
+ASYNC_MAX_CONNECTIONS = 16  # Maximum connections to the server in async mode, e.g. 4 for an HTTP/2 server (0 for one per concurrent download)
 DOCUMENT_TYPE_FILTER = "Planning Comments"  # Type of documents to download
 
 # Performance settings
 USE_CACHE = True  # Enable document data caching
 CACHE_FILE = "document_cache.json"  # Cache file name
 CACHE_EXPIRY = 3600  # Cache expiry in seconds (1 hour)
+HTML_CACHE_FILE = "page_cache.bin"  # Compressed copy of the initial page (zstd if installed, gzip otherwise)
 CONNECTION_TIMEOUT = 30  # Connection timeout in seconds
+DOWNLOAD_CHUNK_SIZE = 262144  # Bytes read and written per chunk when saving a download
 RETRY_ATTEMPTS = 3  # Number of retry attempts for failed downloads
+RETRY_BASE = 0.1  # Minimum delay before a retry (seconds)
+RETRY_CAP = 5.0  # Maximum delay before a retry (seconds)
 BATCH_SIZE = 0  # Number of documents to process in one batch (0 for all)
+ARIA2_THRESHOLD = 0  # Use aria2c (if installed) for parallel batches larger than this (0 to disable; bypasses REQUEST_DELAY pacing)
+AUTO_TUNE_WORKERS = True  # Adapt the number of parallel workers to measured throughput
+TUNE_WINDOW = 20  # Number of completed downloads per throughput measurement
+TUNE_PENALTY = 1.02  # Per-worker cost factor (maximizes throughput / TUNE_PENALTY ** workers)
 
 # HTTP request headers
 HEADERS = {